@@ -5,7 +5,10 @@ import numpy as np
 import plotly.graph_objects as go
 import random
 import plotly.colors as pc
-from tardisbase.testing.regression_comparison.util import get_relative_path
+from tardisbase.testing.regression_comparison.util import (
+    get_relative_path,
+    is_h5_file,
+)
 from tardisbase.testing.regression_comparison.file_manager import FileManager, FileSetup
 from tardisbase.testing.regression_comparison.analyzers import (
     DiffAnalyzer,
@@ -205,8 +208,7 @@ class ReferenceComparer:
             # Compare files in both directories
             for root, _, files in os.walk(self.ref1_path):
                 for file in files:
-                    file_path = Path(file)
-                    if file_path.suffix in (".h5", ".hdf5"):
+                    if is_h5_file(file):
                         rel_path = Path(root).relative_to(self.ref1_path)
                         ref2_file_path = Path(self.ref2_path) / rel_path / file
                         if ref2_file_path.exists():
@@ -218,16 +220,14 @@ class ReferenceComparer:
             print("Only ref1_path provided. Cataloging HDF5 files:")
             for root, _, files in os.walk(self.ref1_path):
                 for file in files:
-                    file_path = Path(file)
-                    if file_path.suffix in (".h5", ".hdf5"):
+                    if is_h5_file(file):
                         print(f"Found HDF5 file: {Path(root) / file}")
         elif self.ref2_path:
             # Only ref2 available - just catalog the files
             print("Only ref2_path provided. Cataloging HDF5 files:")
             for root, _, files in os.walk(self.ref2_path):
                 for file in files:
-                    file_path = Path(file)
-                    if file_path.suffix in (".h5", ".hdf5"):
+                    if is_h5_file(file):
                         print(f"Found HDF5 file: {Path(root) / file}")
 
     def summarise_changes_hdf(self, name, path1, path2):
@@ -1,16 +1,292 @@
+import atexit
+import contextlib
+import functools
+import hashlib
+import json
+import multiprocessing
 import subprocess
+import shutil
+import sys
 import tempfile
+import threading
 import os
+import re
 import logging
+from collections import deque
 from pathlib import Path
-import tomllib
 
 logger = logging.getLogger(__name__)
 
-def run_command_with_logging(cmd, success_message="", error_message="Command failed", **kwargs):
+
+def _detect_conda_manager():
+    """Pick the fastest conda-compatible manager available on PATH."""
+    for manager in ("micromamba", "mamba", "conda"):
+        if shutil.which(manager):
+            return manager
+    return "conda"
+
+
+# micromamba/mamba solve and extract environments several times faster
+# than conda, so prefer them whenever they are installed.
+DEFAULT_CONDA_MANAGER = _detect_conda_manager()
+
+# Cache of known environment names per conda manager, so the per-commit
+# loop does not spawn a `conda env list` subprocess for every commit.
+_ENV_CACHE = {}
+_ENV_CACHE_LOCK = threading.Lock()
+
+# First token of each non-comment line in `conda env list` output.
+_ENV_NAME_RE = re.compile(r"^([^#\s]\S*)", re.M)
+
+# When verbose (the default), conda/pip subprocess output streams to the
+# terminal as it is produced instead of being buffered into
+# multi-megabyte strings; a tail is still retained for diagnostics.
+# Set TARDISBASE_VERBOSE=0 to buffer quietly instead; any other
+# value (or none) keeps streaming, so stray settings like "true"
+# cannot break the import.
+VERBOSE = os.environ.get("TARDISBASE_VERBOSE", "1").strip() != "0"
+
+# Persistent map of lockfile hash -> environment name, so environments
+# built in earlier invocations are reused across runs.
+_CACHE_ROOT = Path.home() / ".cache" / "tardisbase"
+_PERSISTENT_ENV_CACHE_PATH = _CACHE_ROOT / "env_cache.json"
+
+# Shared caches for pip: built wheels keyed by commit hash, and pip's own
+# HTTP/download cache, both reused across runs.
+_WHEEL_CACHE_DIR = _CACHE_ROOT / "wheels"
+_PIP_CACHE_DIR = _CACHE_ROOT / "pip"
+
+# Persistent conda package cache shared by every per-commit env
+# creation, so each unique package is downloaded and extracted at most
+# once and later envs are populated by hardlinks.
+_CONDA_PKGS_DIR = _CACHE_ROOT / "pkgs"
+
+
+def _conda_subprocess_env():
+    """Subprocess environment with the shared conda package cache."""
+    env = os.environ.copy()
+    if "CONDA_PKGS_DIRS" not in env:
+        _CONDA_PKGS_DIR.mkdir(parents=True, exist_ok=True)
+        env["CONDA_PKGS_DIRS"] = str(_CONDA_PKGS_DIR)
+    return env
+
+
+@contextlib.contextmanager
+def _cross_process_lock(name):
+    """
+    Named cross-process flock under the cache dir.
+
+    On platforms without fcntl the lock degrades to a no-op.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    lock_dir = _CACHE_ROOT / "envlocks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    lock_path = lock_dir / f"{name.replace('/', '_')}.lock"
+    with open(lock_path, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _env_creation_lock(env_name):
+    """
+    Cross-process lock serializing creation of one environment.
+
+    Parallel workers may race to build the same lockfile-hashed env; the
+    flock makes the loser wait and then find the env already present
+    instead of building it twice.
+    """
+    return _cross_process_lock(env_name)
+
+
+# Lockfile hashes whose packages have been downloaded into the shared
+# cache, so the corresponding env creations can run with --offline.
+_PRESEEDED_LOCKS = set()
+
+
+def _preseed_package_cache(tardis_repo, commits, conda_manager):
+    """
+    Download all packages for a run's unique lockfiles up front.
+
+    One ``create --download-only`` per unique lockfile populates the
+    shared package cache before the commit loop, so the per-commit env
+    creations become offline hardlink/extract operations with no
+    repository metadata round trips.
+
+    Parameters
+    ----------
+    tardis_repo : git.Repo
+        Git repository object for TARDIS.
+    commits : list of str
+        Commit hashes of the run.
+    conda_manager : str
+        Conda manager to download with.
+    """
+    seen = set()
+    for commit_sha in commits:
+        lockfile_path, lock_hash = get_lockfile_for_commit(tardis_repo, commit_sha)
+        if lockfile_path is None or lock_hash in seen or lock_hash in _PRESEEDED_LOCKS:
+            continue
+        seen.add(lock_hash)
+        cmd = [
+            conda_manager, "create", "--download-only",
+            "--name", "tardisbase-preseed", "--file", str(lockfile_path), "-y",
+        ]
+        downloaded, _ = run_command_with_logging(
+            cmd,
+            success_message=f"Pre-seeding package cache for lockfile {lock_hash}",
+            error_message="Error pre-seeding package cache",
+            env=_conda_subprocess_env(),
+        )
+        if downloaded:
+            _PRESEEDED_LOCKS.add(lock_hash)
+
+
+def _load_persistent_env_cache():
+    """Load the lockfile-hash -> env-name map, or an empty dict."""
+    try:
+        with open(_PERSISTENT_ENV_CACHE_PATH) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_persistent_env_cache(cache):
+    """Write the lockfile-hash -> env-name map, ignoring write failures."""
+    try:
+        _PERSISTENT_ENV_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(_PERSISTENT_ENV_CACHE_PATH, "w") as fh:
+            json.dump(cache, fh, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not persist env cache: {e}")
+
+
+# Cached environments kept before the oldest are evicted. Each env is
+# several GB, so the cache cannot grow without bound across runs.
+_ENV_CACHE_LIMIT = 20
+
+
+def _evict_old_envs(cache, conda_manager, limit=_ENV_CACHE_LIMIT):
+    """
+    Remove the oldest cached environments once the cache exceeds `limit`.
+
+    The persistent cache preserves insertion order and entries are
+    re-inserted on every successful use, so the earliest entries are the
+    least recently used. The environment recorded in ``_LAST_ENV`` is
+    never evicted: it may be hosting an in-flight test run. Removal is
+    best effort; an env that fails to remove is dropped from the map
+    anyway and will be recreated on demand if ever needed again.
+
+    Parameters
+    ----------
+    cache : dict
+        Lockfile-hash -> env-name map (mutated in place).
+    conda_manager : str
+        Conda manager used to remove environments.
+    limit : int, optional
+        Maximum number of entries to keep.
+    """
+    while len(cache) > limit:
+        victim = next(
+            (
+                (lock_hash, env_name)
+                for lock_hash, env_name in cache.items()
+                if env_name != _LAST_ENV["env_name"]
+            ),
+            None,
+        )
+        if victim is None:
+            break
+        lock_hash, env_name = victim
+        del cache[lock_hash]
+        run_command_with_logging(
+            [conda_manager, "env", "remove", "--name", env_name, "-y"],
+            success_message=f"Evicting cached environment {env_name}",
+            error_message=f"Error removing cached environment {env_name}",
+        )
+        with _ENV_CACHE_LOCK:
+            for known in _ENV_CACHE.values():
+                known.discard(env_name)
+
+
+def _record_env_use(lock_hash, env_name, conda_manager):
+    """
+    Record a successful use of an environment in the persistent cache.
+
+    The read-modify-write of the cache file runs under a cross-process
+    lock so concurrent pool workers do not lose each other's entries.
+    The entry is popped and re-inserted on every use — a true LRU touch;
+    plain assignment would keep an existing key's old slot and leave the
+    env this very run depends on as an eviction victim. Eviction itself
+    only runs in the driver process: a worker cannot see which
+    environments its sibling workers are running pytest inside (each
+    tracks its own ``_LAST_ENV``), so it must not pick removal victims.
+
+    Parameters
+    ----------
+    lock_hash : str
+        Lockfile hash of the environment.
+    env_name : str
+        Name of the environment that was just used successfully.
+    conda_manager : str
+        Conda manager used to remove evicted environments.
+    """
+    with _cross_process_lock("env-cache"):
+        persistent_cache = _load_persistent_env_cache()
+        persistent_cache.pop(lock_hash, None)
+        persistent_cache[lock_hash] = env_name
+        if multiprocessing.parent_process() is None:
+            _evict_old_envs(persistent_cache, conda_manager)
+        _save_persistent_env_cache(persistent_cache)
+
+
+def _get_known_envs(conda_manager):
+    """
+    Get the set of existing environment names for a conda manager.
+
+    The underlying ``conda env list`` subprocess is only run on the first
+    call per manager; afterwards the cached set is kept up to date by
+    `create_conda_env` as environments are created and removed.
+
+    Parameters
+    ----------
+    conda_manager : str
+        Conda manager to query ('conda' or 'mamba').
+
+    Returns
+    -------
+    set of str or None
+        Set of environment names, or None if listing environments failed.
+    """
+    with _ENV_CACHE_LOCK:
+        if conda_manager not in _ENV_CACHE:
+            check_cmd = [conda_manager, "env", "list"]
+            listed, result = run_command_with_logging(
+                check_cmd,
+                success_message="Listing conda environments...",
+                error_message="Error checking environments",
+                # The output is parsed below, so it must not go through
+                # the streaming path's tail-with-stderr.
+                capture=True,
+            )
+            if not listed:
+                return None
+            # One C-level regex scan over the whole blob instead of a
+            # Python loop over lines.
+            _ENV_CACHE[conda_manager] = set(_ENV_NAME_RE.findall(result.stdout))
+        return _ENV_CACHE[conda_manager]
+
+def run_command_with_logging(cmd, success_message="", error_message="Command failed", capture=False, **kwargs):
     """
     Run subprocess with consistent logging and error handling.
-    
+
     Parameters
     ----------
     cmd : list
@@ -19,9 +295,13 @@ def run_command_with_logging(cmd, success_message="", error_message="Command fai
         Message to log on success
     error_message : str, optional
         Base error message for failures
+    capture : bool, optional
+        Capture output buffered even when streaming is on. Required for
+        commands whose stdout the caller parses: the streaming path only
+        keeps a tail and merges stderr into it.
     **kwargs
         Additional arguments passed to subprocess.run()
-        
+
     Returns
     -------
     tuple
@@ -30,10 +310,14 @@ def run_command_with_logging(cmd, success_message="", error_message="Command fai
     cmd_str = ' '.join(cmd)
     if success_message:
         logger.info(success_message)
-    
+
     logger.info(f"Executing command: {cmd_str}")
-    result = subprocess.run(cmd, capture_output=True, text=True, **kwargs)
-    
+    if VERBOSE and not capture and not kwargs.keys() - {"cwd", "env"}:
+        # Stream output live; only a tail is kept for error reporting.
+        result = _run_streaming(cmd, cwd=kwargs.get("cwd"), env=kwargs.get("env"))
+    else:
+        result = subprocess.run(cmd, capture_output=True, text=True, **kwargs)
+
     result_status = True
     if result.returncode != 0:
         logger.error(f"{error_message}")
@@ -54,7 +338,155 @@ def run_command_with_logging(cmd, success_message="", error_message="Command fai
     
     return result_status, result
 
-def create_conda_env(env_name, lockfile_path, conda_manager="conda", force_recreate=False):
+def _env_exists(env_name):
+    """
+    Check for a conda environment by probing the envs directory directly.
+
+    A stat of ``<envs_dir>/<name>/conda-meta/history`` replaces the 1-2s
+    ``conda env list`` subprocess in the common case.
+
+    Parameters
+    ----------
+    env_name : str
+        Environment name, or a path to an environment prefix.
+
+    Returns
+    -------
+    bool or None
+        Whether the environment exists, or None if the envs directory
+        could not be determined (caller should fall back to the
+        subprocess-based check).
+    """
+    if "/" in env_name:
+        return (Path(env_name) / "conda-meta").is_dir()
+
+    envs_path = os.environ.get("CONDA_ENVS_PATH")
+    if envs_path:
+        envs_dirs = [Path(entry) for entry in envs_path.split(os.pathsep) if entry]
+    else:
+        envs_dirs = []
+        conda_prefix = os.environ.get("CONDA_PREFIX")
+        if conda_prefix:
+            root = Path(conda_prefix)
+            # CONDA_PREFIX points at the active env; named envs live under
+            # the root installation's envs/ directory.
+            if root.parent.name == "envs":
+                root = root.parent.parent
+            envs_dirs = [root / "envs"]
+
+    if any(
+        (envs_dir / env_name / "conda-meta" / "history").is_file()
+        for envs_dir in envs_dirs
+    ):
+        return True
+
+    # environments.txt registers envs living outside the envs dirs (and
+    # exists even when no env is active).
+    registry = Path.home() / ".conda" / "environments.txt"
+    if registry.is_file():
+        try:
+            for line in registry.read_text().splitlines():
+                prefix = Path(line.strip())
+                if prefix.name == env_name and (prefix / "conda-meta").is_dir():
+                    return True
+        except OSError:
+            pass
+        return False
+
+    return False if envs_dirs else None
+
+
+@functools.lru_cache(maxsize=64)
+def _env_python(env_name, conda_manager=DEFAULT_CONDA_MANAGER):
+    """
+    Resolve a conda environment's python interpreter, memoized.
+
+    Calling the interpreter directly skips roughly a second of
+    ``conda run`` activation overhead per invocation.
+
+    Parameters
+    ----------
+    env_name : str
+        Environment name, or a path to an environment prefix.
+    conda_manager : str, optional
+        Conda manager used for the one-off fallback probe.
+
+    Returns
+    -------
+    Path or None
+        Path to the environment's python, or None if it could not be
+        resolved (caller should fall back to ``conda run``).
+    """
+    if "/" in env_name:
+        candidate = Path(env_name) / "bin" / "python"
+        return candidate if candidate.is_file() else None
+
+    envs_path = os.environ.get("CONDA_ENVS_PATH")
+    if envs_path:
+        envs_dirs = [Path(entry) for entry in envs_path.split(os.pathsep) if entry]
+    else:
+        envs_dirs = []
+        conda_prefix = os.environ.get("CONDA_PREFIX")
+        if conda_prefix:
+            root = Path(conda_prefix)
+            if root.parent.name == "envs":
+                root = root.parent.parent
+            envs_dirs = [root / "envs"]
+    for envs_dir in envs_dirs:
+        candidate = envs_dir / env_name / "bin" / "python"
+        if candidate.is_file():
+            return candidate
+
+    probe = subprocess.run(
+        [conda_manager, "run", "-n", env_name, "python", "-c",
+         "import sys; print(sys.executable)"],
+        capture_output=True, text=True,
+    )
+    if probe.returncode == 0 and probe.stdout.strip():
+        return Path(probe.stdout.strip().splitlines()[-1])
+    return None
+
+
+def _run_streaming(cmd, cwd=None, tail_lines=500, env=None):
+    """
+    Run a command, streaming its output live instead of buffering it all.
+
+    Stdout and stderr are merged and echoed to this process's stdout as
+    they arrive, so long runs are observable and the orchestrator's memory
+    stays bounded; only the last `tail_lines` lines are retained for the
+    caller's error reporting.
+
+    Parameters
+    ----------
+    cmd : list
+        Command to execute.
+    cwd : str or Path, optional
+        Working directory for the command, by default None.
+    tail_lines : int, optional
+        Number of trailing output lines to keep, by default 500.
+    env : dict, optional
+        Environment for the subprocess, by default inherited.
+
+    Returns
+    -------
+    subprocess.CompletedProcess
+        Result with `stdout` set to the retained tail and `stderr` empty
+        (stderr is merged into stdout).
+    """
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, bufsize=1, cwd=cwd, env=env
+    )
+    tail = deque(maxlen=tail_lines)
+    for line in proc.stdout:
+        sys.stdout.write(line)
+        tail.append(line)
+    proc.stdout.close()
+    returncode = proc.wait()
+    return subprocess.CompletedProcess(cmd, returncode, stdout="".join(tail), stderr="")
+
+
+def create_conda_env(env_name, lockfile_path, conda_manager=DEFAULT_CONDA_MANAGER, force_recreate=False, offline=False):
     """
     Create a conda environment from a lockfile.
 
@@ -65,9 +497,13 @@ def create_conda_env(env_name, lockfile_path, conda_manager="conda", force_recre
     lockfile_path : str or Path
         Path to the conda lockfile.
     conda_manager : str, optional
-        Conda manager to use ('conda' or 'mamba'), by default "conda".
+        Conda manager to use, by default the fastest of micromamba, mamba
+        or conda found on PATH.
     force_recreate : bool, optional
         Whether to remove existing environment before creating, by default False.
+    offline : bool, optional
+        Create without network access, by default False. Only safe when
+        the lockfile's packages are already in the package cache.
 
     Returns
     -------
@@ -75,23 +511,17 @@ def create_conda_env(env_name, lockfile_path, conda_manager="conda", force_recre
         True if environment creation succeeded, False otherwise.
     """
     success = False
-    env_exists = False
     create_env = False
 
-    # Check if environment already exists
-    check_cmd = [conda_manager, "env", "list"]
-    environ_found, result = run_command_with_logging(
-        check_cmd, 
-        success_message=f"Checking if environment {env_name} exists...",
-        error_message="Error checking environments"
-    )
-    
-    if environ_found:
-        # Parse environment list to check if env exists
-        env_exists = any(
-            line.strip().startswith(env_name + ' ') 
-            for line in result.stdout.split('\n')
-        )
+    # Check if environment already exists. Prefer a direct stat of the
+    # envs directory; fall back to the cached `env list` output when the
+    # envs directory cannot be located.
+    logger.info(f"Checking if environment {env_name} exists...")
+    known_envs = None
+    env_exists = _env_exists(env_name)
+    if env_exists is None:
+        known_envs = _get_known_envs(conda_manager)
+        env_exists = known_envs is not None and env_name in known_envs
 
     if env_exists and force_recreate:
         # Remove existing environment for recreation
@@ -102,6 +532,9 @@ def create_conda_env(env_name, lockfile_path, conda_manager="conda", force_recre
             error_message="Error removing environment"
         )
         if del_environ:
+            if known_envs is not None:
+                with _ENV_CACHE_LOCK:
+                    known_envs.discard(env_name)
             create_env = True
         else:
             logger.warning(f"Failed to remove environment {env_name}")
@@ -112,56 +545,186 @@ def create_conda_env(env_name, lockfile_path, conda_manager="conda", force_recre
         create_env = True
 
     if create_env:
-        # Create new environment
-        cmd = [conda_manager, "create", "--name", env_name, "--file", str(lockfile_path), "-y"]
-        create_env_proc, _ = run_command_with_logging(
-            cmd,
-            success_message="Creating conda environment",
-            error_message="Error creating environment"
-        )
+        with _env_creation_lock(env_name):
+            # Re-check under the lock: a concurrent worker may have
+            # finished building this env while we waited.
+            if not force_recreate and _env_exists(env_name):
+                logger.info(f"Environment {env_name} was created by a concurrent worker.")
+                return True
+
+            # Create new environment
+            cmd = [conda_manager, "create", "--name", env_name, "--file", str(lockfile_path), "-y"]
+            if offline:
+                cmd.append("--offline")
+            create_env_proc, _ = run_command_with_logging(
+                cmd,
+                success_message="Creating conda environment",
+                error_message="Error creating environment",
+                env=_conda_subprocess_env(),
+            )
+        if create_env_proc and known_envs is not None:
+            with _ENV_CACHE_LOCK:
+                known_envs.add(env_name)
         success = create_env_proc
-    
+
     return success
 
-def get_lockfile_for_commit(tardis_repo, commit_hash):
+@functools.lru_cache(maxsize=512)
+def _get_lockfile_content(repo_path, commit_hash):
     """
-    Get conda lockfile content for a specific commit and save temporarily.
+    Fetch the conda lockfile content for a commit, memoized.
 
     Parameters
     ----------
-    tardis_repo : git.Repo
-        Git repository object for TARDIS.
+    repo_path : str
+        Path to the TARDIS repository working directory.
     commit_hash : str
-        Hash of the commit to get lockfile from.
+        Hash of the commit to get the lockfile from.
 
     Returns
     -------
     str or None
-        Path to temporary lockfile, or None if lockfile not found.
+        Lockfile content, or None if the commit has no lockfile.
     """
-    temp_lockfile_path = None
-    
     try:
+        from git import Repo
         from git.exc import GitCommandError
     except ImportError:
         raise ImportError("GitPython is required. Install with: pip install gitpython")
-    
-    try:
-        # Use git show to get the lockfile content without checking out
-        result = tardis_repo.git.show(f"{commit_hash}:conda-linux-64.lock")
 
-        # Create a temporary file with the lockfile content
-        temp_lockfile = tempfile.NamedTemporaryFile(mode='w', suffix='.lock', delete=False)
-        temp_lockfile.write(result)
-        temp_lockfile.close()
+    prefetched = _PREFETCHED_LOCKFILES.get((str(repo_path), commit_hash), _MISSING)
+    if prefetched is not _MISSING:
+        return prefetched
 
-        temp_lockfile_path = temp_lockfile.name
+    try:
+        # Use git show to get the lockfile content without checking out
+        return Repo(repo_path).git.show(f"{commit_hash}:conda-linux-64.lock")
     except GitCommandError as e:
         logger.warning(f"Could not get lockfile for commit {commit_hash}: {e}")
+        return None
+
+
+# Lockfile contents fetched up front for a whole run, keyed by
+# (repo_path, commit_hash). A value of None records a missing lockfile.
+_PREFETCHED_LOCKFILES = {}
+_MISSING = object()
+
+
+def _batch_show_lockfiles(repo_path, commit_hashes):
+    """
+    Fetch the conda lockfile blobs for many commits over one git pipe.
+
+    A single ``git cat-file --batch`` process replaces one ``git show``
+    fork per commit.
+
+    Parameters
+    ----------
+    repo_path : str or Path
+        Path to the TARDIS repository.
+    commit_hashes : list of str
+        Commit hashes to fetch lockfiles for.
+
+    Returns
+    -------
+    dict of str : str or None
+        Lockfile content per commit; None for commits without a lockfile.
+    """
+    proc = subprocess.Popen(
+        ["git", "-C", str(repo_path), "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    requests = "".join(f"{sha}:conda-linux-64.lock\n" for sha in commit_hashes)
+    out, _ = proc.communicate(requests.encode())
 
-    return temp_lockfile_path
+    contents = {}
+    pos = 0
+    for sha in commit_hashes:
+        header_end = out.index(b"\n", pos)
+        header = out[pos:header_end].decode()
+        pos = header_end + 1
+        if header.endswith(" missing"):
+            logger.warning(f"Could not get lockfile for commit {sha}")
+            contents[sha] = None
+            continue
+        size = int(header.rsplit(" ", 1)[1])
+        contents[sha] = out[pos:pos + size].decode()
+        pos += size + 1  # skip the newline terminating the blob
+    return contents
 
-def run_pytest_with_marker(marker_expr, test_path, regression_path, tardis_path, env_name, conda_manager):
+
+def _prefetch_lockfiles(repo_path, commit_hashes):
+    """Populate the lockfile prefetch cache for a run, best effort."""
+    try:
+        contents = _batch_show_lockfiles(repo_path, commit_hashes)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Lockfile prefetch failed, falling back to git show: {e}")
+        return
+    for sha, content in contents.items():
+        _PREFETCHED_LOCKFILES[(str(repo_path), sha)] = content
+
+
+# Materialized lockfile paths keyed by content hash, so identical
+# lockfiles across commits share one temporary file. All files live in a
+# single process-wide directory that is removed at interpreter exit.
+_LOCKFILE_PATHS = {}
+_LOCKFILE_DIR = None
+
+
+def _get_lockfile_dir():
+    """
+    Return the shared temp directory for lockfiles, creating it once.
+
+    On Linux the directory lives in /dev/shm so the write-then-read
+    round trip through ``conda create --file`` never touches disk.
+    """
+    global _LOCKFILE_DIR
+    if _LOCKFILE_DIR is None:
+        shm = Path("/dev/shm")
+        base = str(shm) if shm.is_dir() else None
+        _LOCKFILE_DIR = Path(tempfile.mkdtemp(prefix="tardis-lock-", dir=base))
+        atexit.register(shutil.rmtree, _LOCKFILE_DIR, ignore_errors=True)
+    return _LOCKFILE_DIR
+
+
+def get_lockfile_for_commit(tardis_repo, commit_hash):
+    """
+    Get conda lockfile content for a specific commit and save temporarily.
+
+    Both the git blob lookup and the temporary file are cached: revisiting
+    a commit is a dict hit, and commits whose lockfile content is identical
+    share a single temp file keyed by content hash.
+
+    Parameters
+    ----------
+    tardis_repo : git.Repo
+        Git repository object for TARDIS.
+    commit_hash : str
+        Hash of the commit to get lockfile from.
+
+    Returns
+    -------
+    tuple
+        (path, lock_hash) where path is the temporary lockfile path and
+        lock_hash is a short sha256 digest of the lockfile content.
+        Both are None if the lockfile was not found.
+    """
+    content = _get_lockfile_content(str(tardis_repo.working_dir), commit_hash)
+    if content is None:
+        return None, None
+
+    lock_hash = hashlib.sha256(content.encode()).hexdigest()[:12]
+
+    temp_lockfile_path = _LOCKFILE_PATHS.get(lock_hash)
+    if temp_lockfile_path is None or not os.path.exists(temp_lockfile_path):
+        lockfile = _get_lockfile_dir() / f"{lock_hash}.lock"
+        lockfile.write_text(content)
+        temp_lockfile_path = str(lockfile)
+        _LOCKFILE_PATHS[lock_hash] = temp_lockfile_path
+
+    return temp_lockfile_path, lock_hash
+
+def run_pytest_with_marker(marker_expr, test_path, regression_path, tardis_path, env_name, conda_manager, use_xdist=False):
     """
     Run pytest with specific marker expression.
 
@@ -179,11 +742,21 @@ def run_pytest_with_marker(marker_expr, test_path, regression_path, tardis_path,
         Name of conda environment to use.
     conda_manager : str
         Conda manager to use ('conda' or 'mamba').
+    use_xdist : bool, optional
+        Shard the run across cores with pytest-xdist
+        (``-n auto --dist=loadfile``), by default False. The environment
+        variable ``PYTEST_XDIST=1`` also enables sharding.
 
     Returns
     -------
     subprocess.CompletedProcess
         Result of the pytest command execution.
+
+    Notes
+    -----
+    The loadfile distribution keeps tests sharing regression-data
+    fixtures on one worker, avoiding concurrent writes to the same HDF5
+    files. pytest-xdist must be installed in the target environment.
     """
     # Build pytest command
     pytest_args = [
@@ -193,19 +766,51 @@ def run_pytest_with_marker(marker_expr, test_path, regression_path, tardis_path,
         "-m", marker_expr
     ]
 
-    # Prepend conda command with appropriate env flag
-    env_flag = "-p" if "/" in env_name else "-n"
-    cmd = [conda_manager, "run", env_flag, env_name] + pytest_args
+    if use_xdist or os.environ.get("PYTEST_XDIST") == "1":
+        pytest_args += ["-n", "auto", "--dist=loadfile"]
+
+    # Regression runs write many HDF5 files that no other process touches
+    # (each run works against private paths/worktrees), so HDF5's
+    # per-open file locking is pure syscall overhead here.
+    env = os.environ.copy()
+    env.setdefault("HDF5_USE_FILE_LOCKING", "FALSE")
+
+    # Invoke the env's interpreter directly instead of paying `conda run`
+    # activation overhead; a minimal activation is replicated via PATH
+    # and CONDA_PREFIX. Fall back to `conda run` if resolution fails.
+    python_bin = _env_python(env_name, conda_manager)
+    if python_bin is not None:
+        cmd = [str(python_bin)] + pytest_args[1:]
+        env["PATH"] = f"{python_bin.parent}{os.pathsep}{env.get('PATH', '')}"
+        env["CONDA_PREFIX"] = str(python_bin.parent.parent)
+    else:
+        env_flag = "-p" if "/" in env_name else "-n"
+        cmd = [conda_manager, "run", env_flag, env_name] + pytest_args
 
     logger.info(f"Running {marker_expr} tests: {' '.join(cmd)}")
-    return subprocess.run(
-        cmd, check=False, capture_output=True, text=True, cwd=tardis_path
-    )
+    return _run_streaming(cmd, cwd=tardis_path, env=env)
+
+@functools.lru_cache(maxsize=64)
+def _load_optional_dependencies(pyproject_path, mtime_ns, size):
+    """
+    Parse optional dependency group names from a pyproject.toml file.
+
+    The mtime_ns and size arguments are part of the cache key only, so
+    the file is re-parsed when it changes on disk.
+    """
+    import tomllib
+
+    data = tomllib.loads(Path(pyproject_path).read_bytes().decode("utf-8"))
+    return tuple(data.get("project", {}).get("optional-dependencies", {}).keys())
+
 
 def get_all_optional_dependencies(tardis_path):
     """
     Get all available optional dependencies from pyproject.toml.
 
+    Parsing is memoized on the file's path, mtime and size, so commits
+    sharing an unchanged pyproject.toml only pay the tomllib cost once.
+
     Parameters
     ----------
     tardis_path : str or Path
@@ -216,18 +821,144 @@ def get_all_optional_dependencies(tardis_path):
     list of str
         List of optional dependency group names.
     """
-    optional_dependencies = []
-    
     pyproject_path = Path(tardis_path) / "pyproject.toml"
-    if pyproject_path.exists():
-        with open(pyproject_path, "rb") as f:
-            data = tomllib.load(f)
+    try:
+        stat = pyproject_path.stat()
+    except OSError:
+        return []
 
-        optional_dependencies = list(data.get("project", {}).get("optional-dependencies", {}).keys())
-    
-    return optional_dependencies
+    return list(
+        _load_optional_dependencies(str(pyproject_path), stat.st_mtime_ns, stat.st_size)
+    )
+
+def _pip_subprocess_env():
+    """Subprocess environment with pip's download cache shared across runs."""
+    env = os.environ.copy()
+    env.setdefault("PIP_CACHE_DIR", str(_PIP_CACHE_DIR))
+    # Point uv (when used) at the conda env's interpreter rather than
+    # requiring an activated virtualenv.
+    env.setdefault("UV_SYSTEM_PYTHON", "1")
+    return env
+
+
+# Whether `uv` is available per (conda_manager, env_name), probed once.
+_UV_AVAILABLE = {}
+
+
+def _pip_command(env_name, conda_manager):
+    """
+    Return the fastest pip-compatible installer frontend for an env.
+
+    uv's Rust resolver is an order of magnitude faster than pip's for
+    the same install, so prefer ``uv pip`` when uv is present in the
+    environment; the probe result is cached per environment.
+
+    Parameters
+    ----------
+    env_name : str
+        Name or path of the conda environment.
+    conda_manager : str
+        Conda manager used to run commands in the environment.
+
+    Returns
+    -------
+    list of str
+        Command prefix, either ``["uv", "pip"]`` or ``["pip"]``.
+    """
+    key = (conda_manager, env_name)
+    if key not in _UV_AVAILABLE:
+        python_bin = _env_python(env_name, conda_manager)
+        if python_bin is not None:
+            _UV_AVAILABLE[key] = (python_bin.parent / "uv").is_file()
+        else:
+            env_flag = "-p" if "/" in env_name else "-n"
+            probe = subprocess.run(
+                [conda_manager, "run", env_flag, env_name, "uv", "--version"],
+                capture_output=True, text=True,
+            )
+            _UV_AVAILABLE[key] = probe.returncode == 0
+    return ["uv", "pip"] if _UV_AVAILABLE[key] else ["pip"]
+
+
+def _env_run_prefix(env_name, conda_manager, tool_cmd):
+    """
+    Build a command prefix that runs a tool inside a conda environment.
+
+    Prefers invoking the environment's binaries directly (the env's
+    ``python -m pip`` or its ``uv``), paying ``conda run`` activation
+    overhead only when the interpreter cannot be resolved.
+
+    Parameters
+    ----------
+    env_name : str
+        Name or path of the conda environment.
+    conda_manager : str
+        Conda manager for the fallback prefix.
+    tool_cmd : list of str
+        Tool invocation, e.g. ``["pip"]`` or ``["uv", "pip"]``.
+
+    Returns
+    -------
+    list of str
+        Full command prefix ending with `tool_cmd`.
+    """
+    python_bin = _env_python(env_name, conda_manager)
+    if python_bin is not None:
+        if tool_cmd[0] == "uv":
+            uv_bin = python_bin.parent / "uv"
+            if uv_bin.is_file():
+                return [str(uv_bin)] + tool_cmd[1:]
+        else:
+            return [str(python_bin), "-m"] + tool_cmd
+    env_flag = "-p" if "/" in env_name else "-n"
+    return [conda_manager, "run", env_flag, env_name] + tool_cmd
+
+
+def _build_wheel(tardis_path, commit_sha, env_name, conda_manager=DEFAULT_CONDA_MANAGER):
+    """
+    Build (or reuse) a TARDIS wheel for a commit in the shared wheel cache.
+
+    Wheels are keyed by commit hash, so a commit pays the C/Cython build
+    cost at most once even when several runs install it.
+
+    Parameters
+    ----------
+    tardis_path : str or Path
+        Path to the TARDIS source checkout for the commit.
+    commit_sha : str
+        Commit hash the checkout corresponds to.
+    env_name : str
+        Name or path of the conda environment to build in.
+    conda_manager : str, optional
+        Conda manager to use, by default the fastest of micromamba, mamba
+        or conda found on PATH.
 
-def install_tardis_in_env(env_name, tardis_path=None, conda_manager="conda"):
+    Returns
+    -------
+    Path or None
+        Directory containing the cached wheel, or None if the build failed.
+    """
+    wheel_dir = _WHEEL_CACHE_DIR / commit_sha
+    if wheel_dir.is_dir() and any(wheel_dir.glob("*.whl")):
+        logger.info(f"Reusing cached wheel for commit {commit_sha}")
+        return wheel_dir
+
+    wheel_dir.mkdir(parents=True, exist_ok=True)
+    cmd = _env_run_prefix(env_name, conda_manager, ["pip"]) + [
+        "wheel", "--no-deps", "-w", str(wheel_dir), str(tardis_path),
+    ]
+    built, _ = run_command_with_logging(
+        cmd,
+        success_message=f"Building TARDIS wheel for commit {commit_sha}",
+        error_message="Error building TARDIS wheel",
+        env=_pip_subprocess_env(),
+    )
+    if built and any(wheel_dir.glob("*.whl")):
+        return wheel_dir
+    return None
+
+
+def install_tardis_in_env(env_name, tardis_path=None, conda_manager=DEFAULT_CONDA_MANAGER, commit_sha=None):
     """
     Install TARDIS with optional dependencies in conda environment.
 
@@ -238,7 +969,12 @@ def install_tardis_in_env(env_name, tardis_path=None, conda_manager="conda"):
     tardis_path : str or Path, optional
         Path to TARDIS repository, by default None.
     conda_manager : str, optional
-        Conda manager to use ('conda' or 'mamba'), by default "conda".
+        Conda manager to use, by default the fastest of micromamba, mamba
+        or conda found on PATH.
+    commit_sha : str, optional
+        Commit hash the checkout corresponds to. When given, a cached
+        wheel for the commit is installed (building it on first use)
+        instead of re-running the editable build.
 
     Returns
     -------
@@ -246,40 +982,100 @@ def install_tardis_in_env(env_name, tardis_path=None, conda_manager="conda"):
         True if installation succeeded, False otherwise.
     """
     success = False
-    
-    # Determine if env_name is a path or name
-    env_flag = "-p" if "/" in env_name else "-n"
 
     # Get all available optional dependencies
     all_extras = get_all_optional_dependencies(tardis_path)
 
-    if all_extras:
+    pip_prefix = _env_run_prefix(
+        env_name, conda_manager, _pip_command(env_name, conda_manager)
+    )
+
+    if commit_sha:
+        # Fast path: install the prebuilt wheel for this commit. Runtime
+        # dependencies come from the lockfile environment, so pip only
+        # has to unpack the wheel.
+        wheel_dir = _build_wheel(tardis_path, commit_sha, env_name, conda_manager)
+        if wheel_dir is not None:
+            # Environments are shared between commits with the same
+            # lockfile hash, so some tardis is usually installed already
+            # and pip would treat a bare "tardis" requirement as
+            # satisfied without unpacking this commit's wheel. Install
+            # the wheel file explicitly with --force-reinstall so the
+            # new build always replaces the previous one.
+            wheel_file = sorted(wheel_dir.glob("*.whl"))[0]
+            cmd = pip_prefix + [
+                "install", "--no-index", "--no-deps", "--force-reinstall",
+                str(wheel_file),
+            ]
+            install_from_wheel, _ = run_command_with_logging(
+                cmd,
+                success_message=f"Installing cached TARDIS wheel for commit {commit_sha}",
+                error_message="Error installing cached TARDIS wheel",
+                env=_pip_subprocess_env(),
+            )
+            success = install_from_wheel
+            if success:
+                _LAST_ENV["install_mode"] = "wheel"
+
+    if not success and all_extras:
         # Try installing with all optional dependencies first
         extras_str = f"[{','.join(all_extras)}]"
-        cmd = [conda_manager, "run", env_flag, env_name, "pip", "install", "-e", f"{tardis_path}{extras_str}"]
+        cmd = pip_prefix + ["install", "--prefer-binary", "-e", f"{tardis_path}{extras_str}"]
         
         install_tardis_extra, _ = run_command_with_logging(
             cmd,
             success_message=f"Installing TARDIS with all extras {all_extras}",
-            error_message="Error installing TARDIS with extras"
+            error_message="Error installing TARDIS with extras",
+            env=_pip_subprocess_env(),
         )
         
         if install_tardis_extra:
             success = True
+            _LAST_ENV["install_mode"] = "editable"
 
     if not success:
         # Fall back to installing just TARDIS
-        cmd = [conda_manager, "run", env_flag, env_name, "pip", "install", "-e", str(tardis_path)]
+        cmd = pip_prefix + ["install", "--prefer-binary", "-e", str(tardis_path)]
         install_tardis_no_extra, _ = run_command_with_logging(
             cmd,
             success_message="Fallback - Installing TARDIS in environment",
-            error_message="Error installing TARDIS (fallback)"
+            error_message="Error installing TARDIS (fallback)",
+            env=_pip_subprocess_env(),
         )
         success = install_tardis_no_extra
-    
+        if success:
+            _LAST_ENV["install_mode"] = "editable"
+
     return success
 
-def setup_environment_for_commit(commit, tardis_repo, tardis_path, conda_manager, default_curr_env, force_recreate):
+# Lockfile hash, environment name and commit of the last successful
+# setup in this process, so consecutive commits with an unchanged
+# lockfile skip create_conda_env entirely (and, when the source tree is
+# also unchanged, the TARDIS install too).
+_LAST_ENV = {
+    "lock_hash": None,
+    "env_name": None,
+    "commit_sha": None,
+    "install_mode": None,
+}
+
+# Paths whose changes require reinstalling TARDIS in the environment.
+_INSTALL_RELEVANT_PATHS = ("pyproject.toml", "setup.py", "setup.cfg", "tardis")
+
+
+def _source_unchanged(tardis_repo, prev_sha, curr_sha):
+    """Check whether no install-relevant files differ between two commits."""
+    try:
+        diff = tardis_repo.git.diff(
+            '--name-only', f"{prev_sha}..{curr_sha}", '--', *_INSTALL_RELEVANT_PATHS
+        )
+    except Exception as e:
+        logger.warning(f"Could not diff {prev_sha}..{curr_sha}: {e}")
+        return False
+    return not diff.strip()
+
+
+def setup_environment_for_commit(commit_sha, tardis_repo, tardis_path, conda_manager, default_curr_env, force_recreate):
     """
     Set up conda environment for a specific commit.
 
@@ -290,41 +1086,437 @@ def setup_environment_for_commit(commit, tardis_repo, tardis_path, conda_manager
     """
     setup_success = False
     final_env_name = None
-    temp_lockfile_path = None
-    
-    env_name = f"tardis-test-{commit.hexsha[:8]}"
-    logger.info(f"Creating conda environment: {env_name}")
-    
+
     # Get the lockfile for this specific commit
-    temp_lockfile_path = get_lockfile_for_commit(tardis_repo, commit.hexsha)
-    
+    temp_lockfile_path, lock_hash = get_lockfile_for_commit(tardis_repo, commit_sha)
+
     if temp_lockfile_path is None:
-        logger.error(f"Could not get lockfile for commit {commit.hexsha}")
+        logger.error(f"Could not get lockfile for commit {commit_sha}")
         setup_success, final_env_name = handle_fallback(default_curr_env)
     else:
-        # Try to create the environment
-        env_creation_success = create_conda_env(
-            env_name, temp_lockfile_path, conda_manager, force_recreate=force_recreate
-        )
+        # Environments are content-addressed by lockfile hash, so commits
+        # sharing an identical lockfile reuse a single environment.
+        persistent_cache = _load_persistent_env_cache()
+        env_name = persistent_cache.get(lock_hash, f"tardis-lock-{lock_hash}")
+        logger.info(f"Using conda environment: {env_name}")
+        env_reused = False
+        if lock_hash == _LAST_ENV["lock_hash"] and not force_recreate:
+            # Adjacent commits rarely touch the lockfile; skip the env
+            # existence check and creation and go straight to the
+            # per-commit source install.
+            env_name = _LAST_ENV["env_name"]
+            logger.info(
+                f"Lockfile unchanged from previous commit; reusing environment {env_name}"
+            )
+            env_creation_success = True
+            env_reused = True
+        else:
+            # Try to create the environment
+            env_creation_success = create_conda_env(
+                env_name, temp_lockfile_path, conda_manager,
+                force_recreate=force_recreate,
+                offline=lock_hash in _PRESEEDED_LOCKS,
+            )
         
         if not env_creation_success:
-            logger.error(f"Failed to create conda environment for commit {commit.hexsha}")
+            logger.error(f"Failed to create conda environment for commit {commit_sha}")
             setup_success, final_env_name = handle_fallback(default_curr_env)
         else:
-            # Install TARDIS in the newly created environment
-            tardis_install_success = install_tardis_in_env(env_name, tardis_path, conda_manager)
+            if (
+                env_reused
+                and _LAST_ENV["commit_sha"]
+                # Editable installs point into the previous commit's
+                # (since removed) worktree, so only wheel installs can
+                # be carried over.
+                and _LAST_ENV["install_mode"] == "wheel"
+                and _source_unchanged(tardis_repo, _LAST_ENV["commit_sha"], commit_sha)
+            ):
+                # Neither the lockfile nor any install-relevant source
+                # changed, so the install from the previous commit is
+                # still valid.
+                logger.info(
+                    f"Source unchanged from {_LAST_ENV['commit_sha'][:8]}; skipping TARDIS install"
+                )
+                tardis_install_success = True
+            else:
+                # Install TARDIS in the newly created environment
+                tardis_install_success = install_tardis_in_env(
+                    env_name, tardis_path, conda_manager, commit_sha=commit_sha
+                )
             if not tardis_install_success:
-                logger.error(f"Failed to install TARDIS in environment for commit {commit.hexsha}")
+                logger.error(f"Failed to install TARDIS in environment for commit {commit_sha}")
                 setup_success, final_env_name = handle_fallback(default_curr_env)
             else:
                 setup_success = True
                 final_env_name = env_name
-        
-        # Clean up temporary lockfile
-        os.unlink(temp_lockfile_path)
-    
+                _LAST_ENV["lock_hash"] = lock_hash
+                _LAST_ENV["env_name"] = env_name
+                _LAST_ENV["commit_sha"] = commit_sha
+                _record_env_use(lock_hash, env_name, conda_manager)
+
     return setup_success, final_env_name
 
+
+def _prewarm_environment(commit_sha, tardis_repo, conda_manager):
+    """
+    Run the side-effect-free part of environment setup for a later commit.
+
+    Materializes the commit's lockfile and creates its conda environment
+    when no environment for that lockfile hash exists yet. The TARDIS
+    install is deliberately left to the synchronous setup that runs after
+    the current commit's tests finish: adjacent commits usually share a
+    lockfile hash and therefore an environment, and installing into it
+    from the background would replace the code the in-flight pytest run
+    is executing.
+    """
+    temp_lockfile_path, lock_hash = get_lockfile_for_commit(tardis_repo, commit_sha)
+    if temp_lockfile_path is None or lock_hash == _LAST_ENV["lock_hash"]:
+        # No lockfile, or the next commit shares the environment that is
+        # currently under test — nothing can be prepared safely here.
+        return
+    persistent_cache = _load_persistent_env_cache()
+    env_name = persistent_cache.get(lock_hash, f"tardis-lock-{lock_hash}")
+    create_conda_env(
+        env_name, temp_lockfile_path, conda_manager,
+        offline=lock_hash in _PRESEEDED_LOCKS,
+    )
+
+
+def _rev_list(repo_path, branch, n):
+    """
+    List the last n commit hashes on a branch, oldest first.
+
+    A single ``git rev-list`` subprocess replaces GitPython's commit
+    iteration, which constructs a full Commit object per commit.
+
+    Parameters
+    ----------
+    repo_path : str or Path
+        Path to the git repository.
+    branch : str
+        Branch name to iterate commits from.
+    n : int
+        Number of commits to list.
+
+    Returns
+    -------
+    list of str
+        Commit hashes, oldest first.
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo_path), "rev-list", "--reverse", "-n", str(n), branch],
+        check=True, capture_output=True, text=True
+    )
+    return result.stdout.split()
+
+
+def _resolve_commits(repo_path, commit_hashes):
+    """
+    Validate commit hashes with a single git cat-file --batch-check call.
+
+    Parameters
+    ----------
+    repo_path : str or Path
+        Path to the git repository.
+    commit_hashes : list of str
+        Commit hashes to validate.
+
+    Returns
+    -------
+    list of str
+        The full object hashes, in input order.
+
+    Raises
+    ------
+    ValueError
+        If any of the hashes does not name a commit in the repository.
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo_path), "cat-file", "--batch-check"],
+        input="".join(f"{commit_hash}\n" for commit_hash in commit_hashes),
+        check=True, capture_output=True, text=True
+    )
+    resolved = []
+    for requested, line in zip(commit_hashes, result.stdout.splitlines()):
+        fields = line.split()
+        if len(fields) < 2 or fields[1] != "commit":
+            raise ValueError(f"{requested} is not a commit in {repo_path}")
+        resolved.append(fields[0])
+    return resolved
+
+
+def ensure_worktree(repo, ref):
+    """
+    Create a detached git worktree for a commit or ref.
+
+    Worktrees share the repository's object store, so only the files that
+    differ from the current checkout are materialized and the shared
+    working tree is never rewritten.
+
+    Parameters
+    ----------
+    repo : git.Repo
+        Repository to add the worktree to.
+    ref : str
+        Commit hash or ref to check out in the worktree.
+
+    Returns
+    -------
+    Path
+        Path to the new worktree.
+    """
+    scratch_dir = tempfile.mkdtemp(prefix=f"tardis-wt-{ref[:8]}-")
+    worktree_path = Path(scratch_dir) / "worktree"
+    repo.git.worktree('add', '--detach', str(worktree_path), ref)
+    return worktree_path
+
+
+def remove_worktree(repo, worktree_path):
+    """
+    Remove a worktree created by `ensure_worktree` and its scratch dir.
+
+    Parameters
+    ----------
+    repo : git.Repo
+        Repository the worktree belongs to.
+    worktree_path : str or Path
+        Path returned by `ensure_worktree`.
+    """
+    try:
+        repo.git.worktree('remove', '--force', str(worktree_path))
+    except Exception as e:
+        logger.warning(f"Could not remove worktree {worktree_path}: {e}")
+    shutil.rmtree(Path(worktree_path).parent, ignore_errors=True)
+
+
+# Pytest marker expressions run for every commit, in order.
+# A single combined invocation covers both former phases while paying the
+# pytest collection and TARDIS import cost only once per commit.
+TEST_PHASES = [
+    ("continuum or not continuum", "Combined run"),
+]
+
+
+def run_test_phases(commit_sha, test_path, regression_path, tardis_path, env_name, conda_manager, use_xdist=False):
+    """
+    Run all pytest phases for a single commit and log any failures.
+
+    Parameters
+    ----------
+    commit_sha : str
+        Hash of the TARDIS commit being tested (for log messages).
+    test_path : str
+        Path to the test file or directory.
+    regression_path : str or Path
+        Path to the regression data directory tests should write to.
+    tardis_path : str or Path
+        Path to the TARDIS checkout to run tests from.
+    env_name : str
+        Name of the conda environment to use.
+    conda_manager : str
+        Conda manager to use ('conda' or 'mamba').
+    use_xdist : bool, optional
+        Shard each pytest run across cores with pytest-xdist, by
+        default False.
+
+    Returns
+    -------
+    list of subprocess.CompletedProcess
+        One result per phase in `TEST_PHASES`.
+    """
+    results = []
+    for marker, phase_name in TEST_PHASES:
+        logger.info(f"\n=== {phase_name}: Running '{marker}' tests for commit {commit_sha} ===")
+        result = run_pytest_with_marker(marker, test_path, regression_path, tardis_path, env_name, conda_manager, use_xdist=use_xdist)
+        results.append(result)
+
+        if result.returncode != 0:
+            logger.warning(f"'{marker}' tests had failures for commit {commit_sha}")
+            logger.warning(f"Return code: {result.returncode}")
+            if result.stdout.strip():
+                logger.error(f"Stdout:\n{result.stdout.strip()}")
+            if result.stderr.strip():
+                logger.error(f"Stderr:\n{result.stderr.strip()}")
+
+    return results
+
+
+def _stage_regression_changes(repo, subdir=None):
+    """
+    Stage regression-data changes without an unscoped ``git add -A``.
+
+    An unscoped add stats every file in the regression repo per commit.
+    When the subtree the tests write to is known, the add is scoped to
+    it; otherwise the paths reported by a single ``git status
+    --porcelain`` are staged explicitly.
+
+    Parameters
+    ----------
+    repo : git.Repo
+        Regression data repository (or worktree) to stage changes in.
+    subdir : str or Path, optional
+        Subtree the tests are known to write under.
+
+    Returns
+    -------
+    bool
+        True if anything is staged afterwards.
+    """
+    from git.exc import GitCommandError
+
+    if subdir is not None:
+        repo.git.add('-A', '--', str(subdir))
+    else:
+        status = repo.git.status('--porcelain', '--untracked-files=all', '-z')
+        tokens = status.split('\x00')
+        paths = []
+        i = 0
+        while i < len(tokens):
+            entry = tokens[i]
+            i += 1
+            if not entry:
+                continue
+            # Rename/copy records carry the source path as a separate
+            # NUL token with no status prefix; consume it so it is not
+            # misread as the next record's path.
+            if 'R' in entry[:2] or 'C' in entry[:2]:
+                src = tokens[i]
+                i += 1
+                if entry[1] in 'RC':
+                    # Worktree-side rename: the source is still in the
+                    # index, so staging it records the deletion. An
+                    # index-side rename's source is already gone from
+                    # both index and worktree and matches no pathspec.
+                    paths.append(src)
+            # Entries whose worktree column is clean are fully staged
+            # already; handing them to git add would fail for paths
+            # that no longer exist anywhere (staged deletes/renames).
+            if entry[1] != ' ':
+                paths.append(entry[3:])
+        if paths:
+            repo.git.add('-A', '--', *paths)
+
+    # diff-index --quiet answers "anything staged?" via exit status
+    # without materializing a name list.
+    try:
+        repo.git.diff_index('--cached', '--quiet', 'HEAD')
+    except GitCommandError:
+        return True
+    return False
+
+
+def _snapshot_staged_changes(repo, worktree_path):
+    """
+    Capture a worktree's staged changes as full file contents.
+
+    Parameters
+    ----------
+    repo : git.Repo
+        Repository whose index holds the staged changes.
+    worktree_path : str or Path
+        Working tree the staged paths are read from.
+
+    Returns
+    -------
+    tuple
+        (files: dict mapping path to bytes, deleted: list of str).
+
+    Notes
+    -----
+    Snapshots are replayed by the driver in commit order, so two commits
+    that regenerate the same regression output simply overwrite each
+    other — unlike diffs against the run-start HEAD, whose preimages go
+    stale as soon as an earlier commit's changes land.
+    """
+    output = repo.git.diff('--cached', '--name-status', '-z')
+    files = {}
+    deleted = []
+    tokens = output.split('\0')
+    i = 0
+    while i + 1 < len(tokens):
+        status = tokens[i]
+        if not status:
+            i += 1
+            continue
+        if status.startswith(('R', 'C')):
+            # Rename/copy records carry two paths; the old path of a
+            # rename no longer exists in the result.
+            if status.startswith('R'):
+                deleted.append(tokens[i + 1])
+            path = tokens[i + 2]
+            i += 3
+        else:
+            path = tokens[i + 1]
+            i += 2
+        if status[0] == 'D':
+            deleted.append(path)
+        else:
+            files[path] = (Path(worktree_path) / path).read_bytes()
+    return files, deleted
+
+
+def _process_one_commit(commit_sha, index, total, tardis_repo_path, regression_data_repo_path,
+                        test_path, conda_manager, default_curr_env, force_recreate, use_new_envs,
+                        regression_subdir=None, use_xdist=False):
+    """
+    Worker for the parallel commit loop in `run_tests`.
+
+    Runs environment setup and all pytest phases for one commit. The commit
+    is checked out into a private git worktree and regression output is
+    written to a private worktree of the regression data repo, so concurrent
+    workers never touch the shared working trees. The regression changes are
+    returned as a content snapshot that the driver replays in commit order.
+
+    Parameters
+    ----------
+    commit_sha : str
+        Hash of the TARDIS commit to process.
+    index, total : int
+        Position of this commit in the run (for log messages).
+    tardis_repo_path, regression_data_repo_path : str
+        Paths to the TARDIS and regression data repositories.
+    test_path, conda_manager, default_curr_env, force_recreate, use_new_envs, regression_subdir, use_xdist
+        Same meaning as the corresponding `run_tests` parameters.
+
+    Returns
+    -------
+    tuple or None
+        (files: dict of path -> bytes, deleted: list of str,
+        returncodes: list of int), or None if environment setup failed
+        and no fallback environment was available.
+    """
+    from git import Repo
+
+    tardis_repo = Repo(tardis_repo_path)
+    regression_repo = Repo(regression_data_repo_path)
+
+    logger.info(f"Processing commit {index}/{total}: {commit_sha}")
+
+    tardis_worktree = ensure_worktree(tardis_repo, commit_sha)
+    regression_worktree = ensure_worktree(regression_repo, 'HEAD')
+    try:
+        if use_new_envs:
+            success, env_name = setup_environment_for_commit(commit_sha, tardis_repo, tardis_worktree, conda_manager, default_curr_env, force_recreate)
+        else:
+            success, env_name = handle_fallback(default_curr_env)
+
+        if not success:
+            return None
+
+        results = run_test_phases(
+            commit_sha, test_path, regression_worktree, tardis_worktree, env_name,
+            conda_manager, use_xdist=use_xdist
+        )
+
+        regression_wt_repo = Repo(regression_worktree)
+        _stage_regression_changes(regression_wt_repo, regression_subdir)
+        files, deleted = _snapshot_staged_changes(regression_wt_repo, regression_worktree)
+        return files, deleted, [result.returncode for result in results]
+    finally:
+        remove_worktree(tardis_repo, tardis_worktree)
+        remove_worktree(regression_repo, regression_worktree)
+
+
 def handle_fallback(default_curr_env):
     """Handle fallback to default environment."""
     success = False
@@ -339,7 +1531,25 @@ def handle_fallback(default_curr_env):
     
     return success, env_name
 
-def run_tests(tardis_repo_path, regression_data_repo_path, branch, commits_input=None, n=10, test_path="tardis/spectrum/tests/test_spectrum_solver.py", conda_manager="conda", default_curr_env=None, force_recreate=False, use_new_envs=True):
+def _commit_pending(regression_repo, pending_shas, pending_indices):
+    """
+    Commit staged regression changes covering one or more tardis commits.
+
+    Single-commit groups keep the historical message format; larger
+    groups list the covered tardis commit hashes in the message body.
+    """
+    if len(pending_shas) == 1:
+        message = f"Regression data for tardis commit {pending_indices[0]}"
+    else:
+        sha_list = "\n".join(pending_shas)
+        message = (
+            f"Regression data for tardis commits "
+            f"{pending_indices[0]}-{pending_indices[-1]}\n\n{sha_list}"
+        )
+    return regression_repo.index.commit(message)
+
+
+def run_tests(tardis_repo_path, regression_data_repo_path, branch, commits_input=None, n=10, test_path="tardis/spectrum/tests/test_spectrum_solver.py", conda_manager=DEFAULT_CONDA_MANAGER, default_curr_env=None, force_recreate=False, use_new_envs=True, max_workers=1, regression_subdir=None, commit_every=1, use_xdist=False):
     """
     Run pytest across multiple TARDIS commits.
 
@@ -359,13 +1569,39 @@ def run_tests(tardis_repo_path, regression_data_repo_path, branch, commits_input
     test_path : str, optional
         Path to test file, by default "tardis/spectrum/tests/test_spectrum_solver.py".
     conda_manager : str, optional
-        Conda manager to use ('conda' or 'mamba'), by default "conda".
+        Conda manager to use, by default the fastest of micromamba, mamba
+        or conda found on PATH.
     default_curr_env : str, optional
         Default environment to fall back to, by default None.
     force_recreate : bool, optional
         Whether to force recreate conda environments, by default False.
     use_new_envs : bool, optional
         Whether to use new environments for each commit, by default True.
+    max_workers : int, optional
+        Number of commits to process concurrently, by default 1 (sequential).
+        When greater than 1, each commit runs in its own process against
+        private git worktrees checked out from the run-start HEAD. Each
+        worker returns its staged regression changes as a content
+        snapshot, and the driver replays the snapshots in commit order:
+        commits touching the same files overwrite one another in order.
+        This is not byte-identical to a sequential run — a file that one
+        commit changes and a later commit regenerates back to its
+        run-start content is absent from the later commit's snapshot, so
+        the earlier version persists in the replayed history.
+    regression_subdir : str, optional
+        Subtree of the regression data repo the tests write under. When
+        given, per-commit staging is scoped to it instead of walking the
+        whole repository.
+    commit_every : int, optional
+        Number of tardis commits to group into one regression data
+        commit, by default 1 (one regression commit per tardis commit).
+        Grouping cuts per-commit git tree/pack writes when per-commit
+        granularity in the regression history is not needed.
+    use_xdist : bool, optional
+        Shard each pytest run across cores with pytest-xdist
+        (``-n auto --dist=loadfile``), by default False. Requires
+        pytest-xdist in the target environments. The environment
+        variable ``PYTEST_XDIST=1`` also enables sharding.
 
     Returns
     -------
@@ -392,66 +1628,173 @@ def run_tests(tardis_repo_path, regression_data_repo_path, branch, commits_input
             commits_input = [commits_input]
         
         n = len(commits_input)
-        commits = []
-        for commit_hash in commits_input:
-            commit = tardis_repo.commit(commit_hash)
-            commits.append(commit)
+        commits = _resolve_commits(tardis_path, commits_input)
     else:
-        commits = list(tardis_repo.iter_commits(branch, max_count=n))
-        commits.reverse()
+        commits = _rev_list(tardis_path, branch, n)
+
+    # Fetch every commit's lockfile over one git cat-file pipe up front,
+    # instead of one git show subprocess per commit inside the loop.
+    _prefetch_lockfiles(tardis_path, commits)
+
+    if use_new_envs:
+        # Download every unique lockfile's packages into the shared cache
+        # now, so per-commit env creations run offline.
+        _preseed_package_cache(tardis_repo, commits, conda_manager)
 
     processed_commits = []
     regression_commits = []
 
-    for i, commit in enumerate(commits, 1):
-        logger.info(f"Processing commit {i}/{n}: {commit.hexsha}")
+    if max_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
 
-        if use_new_envs:
-            success, env_name = setup_environment_for_commit(commit, tardis_repo, tardis_path, conda_manager, default_curr_env, force_recreate)
-        else:
-            success, env_name = handle_fallback(default_curr_env)
-            
-        if success:
-            # Now checkout the commit for running tests (after environment creation)
-            tardis_repo.git.checkout(commit.hexsha)
-            tardis_repo.git.reset('--hard')
-            tardis_repo.git.clean('-fd')
-
-            # Define test phases
-            test_phases = [
-                ("not continuum", "Phase 1"),
-                ("continuum", "Phase 2")
-            ]
+        outcomes = {}
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(commits))) as pool:
+            futures = {
+                pool.submit(
+                    _process_one_commit, commit_sha, i, n,
+                    str(tardis_path), str(regression_path), test_path,
+                    conda_manager, default_curr_env, force_recreate, use_new_envs,
+                    regression_subdir, use_xdist
+                ): commit_sha
+                for i, commit_sha in enumerate(commits, 1)
+            }
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
 
-            results = []
-            for marker, phase_name in test_phases:
-                logger.info(f"\n=== {phase_name}: Running '{marker}' tests for commit {commit.hexsha} ===")
-                result = run_pytest_with_marker(marker, test_path, regression_path, tardis_path, env_name, conda_manager)
-                results.append(result)
-                
-                if result.returncode != 0:
-                    logger.warning(f"'{marker}' tests had failures for commit {commit.hexsha}")
-                    logger.warning(f"Return code: {result.returncode}")
-                    if result.stdout.strip():
-                        logger.error(f"Stdout:\n{result.stdout.strip()}")
-                    if result.stderr.strip():
-                        logger.error(f"Stderr:\n{result.stderr.strip()}")
-
-            # Even if tests failed, if regression data was generated, commit it
-            regression_repo.git.add(A=True)
-            # Check if anything was actually staged
-            if not regression_repo.git.diff('--cached', '--name-only').strip():
-                raise Exception(f"No data to add - git add was empty for commit {commit.hexsha}")
-
-            regression_commit = regression_repo.index.commit(f"Regression data for tardis commit {i}")
-            regression_commits.append(regression_commit.hexsha)
-            processed_commits.append(commit.hexsha)
+        # Replay the regression snapshots sequentially in commit order so
+        # the regression history matches a sequential run. Snapshots are
+        # full file contents, so commits touching the same outputs
+        # overwrite one another in order instead of failing the way
+        # stale-base patches would.
+        pending_shas = []
+        pending_indices = []
+        for i, commit_sha in enumerate(commits, 1):
+            outcome = outcomes.get(commit_sha)
+            if outcome is None:
+                continue
+            files, deleted, returncodes = outcome
+
+            if not files and not deleted and not pending_shas:
+                raise Exception(f"No data to add - git add was empty for commit {commit_sha}")
+            for rel_path, content in files.items():
+                dest = regression_path / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                dest.write_bytes(content)
+            # Stage in chunks to stay under the argument-length limit.
+            paths = sorted(files)
+            for start in range(0, len(paths), 200):
+                regression_repo.git.add('--', *paths[start:start + 200])
+            for start in range(0, len(deleted), 200):
+                regression_repo.git.rm(
+                    '--ignore-unmatch', '--', *deleted[start:start + 200]
+                )
 
-            # Check overall success
-            if all(result.returncode == 0 for result in results):
-                logger.info(f"All tests passed for commit {commit.hexsha}")
+            pending_shas.append(commit_sha)
+            pending_indices.append(i)
+            if len(pending_shas) >= commit_every:
+                regression_commit = _commit_pending(regression_repo, pending_shas, pending_indices)
+                regression_commits.append(regression_commit.hexsha)
+                pending_shas = []
+                pending_indices = []
+            processed_commits.append(commit_sha)
+
+            if all(returncode == 0 for returncode in returncodes):
+                logger.info(f"All tests passed for commit {commit_sha}")
             else:
-                logger.warning(f"Tests completed with some failures for commit {commit.hexsha}, but regression data was generated")
+                logger.warning(f"Tests completed with some failures for commit {commit_sha}, but regression data was generated")
+
+        if pending_shas:
+            regression_commit = _commit_pending(regression_repo, pending_shas, pending_indices)
+            regression_commits.append(regression_commit.hexsha)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        pending_shas = []
+        pending_indices = []
+        # One background thread pre-warms the next commit's worktree and
+        # — when its lockfile differs from the active environment's —
+        # creates the env while the current commit's tests run. The
+        # TARDIS install stays out of the pre-warm: it would otherwise
+        # target the very environment the running tests execute in.
+        setup_pool = ThreadPoolExecutor(max_workers=1)
+        prewarmed = None  # (commit_sha, worktree_path, prewarm_future)
+        try:
+            for i, commit_sha in enumerate(commits, 1):
+                logger.info(f"Processing commit {i}/{n}: {commit_sha}")
+
+                # Check the commit out into a private worktree instead of
+                # rewriting the shared working tree with checkout/reset/clean.
+                if prewarmed is not None and prewarmed[0] == commit_sha:
+                    _, worktree_path, prewarm_future = prewarmed
+                    prewarmed = None
+                    # Wait for the background env creation before the
+                    # synchronous setup below probes for the same env.
+                    try:
+                        prewarm_future.result()
+                    except Exception as e:
+                        logger.warning(f"Pre-warm for commit {commit_sha} failed: {e}")
+                else:
+                    worktree_path = ensure_worktree(tardis_repo, commit_sha)
+                try:
+                    if use_new_envs:
+                        success, env_name = setup_environment_for_commit(commit_sha, tardis_repo, worktree_path, conda_manager, default_curr_env, force_recreate)
+                    else:
+                        success, env_name = handle_fallback(default_curr_env)
+
+                    if not success:
+                        continue
+
+                    if use_new_envs and not force_recreate and i < len(commits):
+                        next_sha = commits[i]
+                        next_worktree = ensure_worktree(tardis_repo, next_sha)
+                        prewarmed = (
+                            next_sha,
+                            next_worktree,
+                            setup_pool.submit(
+                                _prewarm_environment, next_sha, tardis_repo,
+                                conda_manager,
+                            ),
+                        )
+
+                    results = run_test_phases(
+                        commit_sha, test_path, regression_path, worktree_path, env_name,
+                        conda_manager, use_xdist=use_xdist
+                    )
+
+                    # Even if tests failed, if regression data was generated, commit it
+                    if not _stage_regression_changes(regression_repo, regression_subdir) and not pending_shas:
+                        raise Exception(f"No data to add - git add was empty for commit {commit_sha}")
+
+                    pending_shas.append(commit_sha)
+                    pending_indices.append(i)
+                    if len(pending_shas) >= commit_every:
+                        regression_commit = _commit_pending(regression_repo, pending_shas, pending_indices)
+                        regression_commits.append(regression_commit.hexsha)
+                        pending_shas = []
+                        pending_indices = []
+                    processed_commits.append(commit_sha)
+
+                    # Check overall success
+                    if all(result.returncode == 0 for result in results):
+                        logger.info(f"All tests passed for commit {commit_sha}")
+                    else:
+                        logger.warning(f"Tests completed with some failures for commit {commit_sha}, but regression data was generated")
+                finally:
+                    remove_worktree(tardis_repo, worktree_path)
+        finally:
+            if prewarmed is not None:
+                # An unconsumed pre-warm (early exit or failure): wait for
+                # it so its worktree can be removed safely.
+                try:
+                    prewarmed[2].result()
+                except Exception:
+                    pass
+                remove_worktree(tardis_repo, prewarmed[1])
+            setup_pool.shutdown()
+
+        if pending_shas:
+            regression_commit = _commit_pending(regression_repo, pending_shas, pending_indices)
+            regression_commits.append(regression_commit.hexsha)
 
     logger.info("\nProcessed Tardis Commits:")
     for hash in processed_commits:
@@ -1,9 +1,54 @@
-from pathlib import Path
+import functools
 import logging
+import os
+import sys
+from pathlib import Path
+
 from tardisbase.testing.regression_comparison import CONFIG
 
 logger = logging.getLogger(__name__)
 
+H5_SUFFIXES = frozenset({".h5", ".hdf5"})
+
+
+def is_h5_file(name):
+    """
+    Check whether a file name has an HDF5 suffix.
+
+    The check is case-insensitive so files like ``DATA.H5`` are recognized
+    on case-preserving filesystems.
+
+    Parameters
+    ----------
+    name : str or Path
+        File name or path to test.
+
+    Returns
+    -------
+    bool
+        True if the name ends with ``.h5`` or ``.hdf5`` (any case).
+    """
+    name = str(name)
+    return name[name.rfind(".") :].lower() in H5_SUFFIXES
+
+
+# ANSI escape codes, hoisted so color_print does not rebuild the table
+# on every call (it runs in tight diff-report loops).
+_COLORS = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "reset": "\033[0m",
+}
+_RESET = _COLORS["reset"]
+
+# Pre-encoded variants for the binary fast path, skipping per-call
+# str.encode of the escape codes.
+_ENCODED_COLORS = {name: code.encode() for name, code in _COLORS.items()}
+_RESET_BYTES = _ENCODED_COLORS["reset"] + b"\n"
+
+
 def color_print(text, color):
     """
     Print text to the console with ANSI color formatting.
@@ -29,15 +74,27 @@ def color_print(text, color):
     - Yellow: \\033[93m
     - Blue: \\033[94m
     - Reset: \\033[0m
+
+    When stdout is not a terminal (e.g. redirected CI logs), the escape
+    codes are omitted. Writes go through ``sys.stdout.buffer`` when
+    available, avoiding the text layer's per-call overhead in tight
+    diff-report loops; the text layer is flushed first so output
+    interleaves correctly with surrounding ``print()`` calls.
     """
-    colors = {
-        "red": "\033[91m",
-        "green": "\033[92m",
-        "yellow": "\033[93m",
-        "blue": "\033[94m",
-        "reset": "\033[0m",
-    }
-    print(f"{colors.get(color, '')}{text}{colors['reset']}")
+    out = sys.stdout
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:
+        # Replaced streams (notebooks, pytest capture) may not expose a
+        # binary buffer; fall back to the text interface.
+        out.write(f"{_COLORS.get(color, '')}{text}{_RESET}\n")
+        return
+    # Anything print() has block-buffered must land before the direct
+    # binary write, or redirected logs come out reordered.
+    out.flush()
+    if out.isatty():
+        buffer.write(_ENCODED_COLORS.get(color, b"") + str(text).encode() + _RESET_BYTES)
+    else:
+        buffer.write(str(text).encode() + b"\n")
 
 
 def get_relative_path(path, base):
@@ -69,18 +126,44 @@ def get_relative_path(path, base):
 
     Notes
     -----
-    This function uses pathlib.Path.relative_to() internally, which requires
-    that the target path be within the base directory hierarchy. If the paths
-    are on different drives (Windows) or don't share a common ancestor,
-    a ValueError will be raised.
+    The common case — a target nested directly under the base — is
+    handled with plain string arithmetic, since this function runs once
+    per file during regression diffing and PurePath construction
+    dominates its cost. Other inputs fall back to
+    pathlib.Path.relative_to(), which requires that the target path be
+    within the base directory hierarchy. If the paths are on different
+    drives (Windows) or don't share a common ancestor, a ValueError will
+    be raised.
     """
+    path_str = os.fspath(path)
+    base_str = os.fspath(base)
+    if isinstance(path_str, str) and isinstance(base_str, str):
+        if path_str.startswith(base_str + os.sep):
+            return path_str[len(base_str) + 1:]
     return str(Path(path).relative_to(base))
 
 
+@functools.lru_cache(maxsize=128)
+def _last_n_commit_hashes(repo_path, n, head_sha):
+    """
+    List the last n commit hashes of a repository, memoized.
+
+    The head_sha argument is part of the cache key only, so the walk is
+    redone when the repository's HEAD moves.
+    """
+    from git import Repo
+
+    repo = Repo(repo_path)
+    return tuple(commit.hexsha for commit in repo.iter_commits(max_count=n))
+
+
 def get_last_n_commits(n=2, repo_path=None):
     """
     Get the last n commits from a git repository using GitPython.
 
+    Results are cached per (repository, n, HEAD), so repeated lookups in
+    one session only walk the history once until new commits land.
+
     Parameters
     ----------
     n : int, optional
@@ -102,14 +185,13 @@ def get_last_n_commits(n=2, repo_path=None):
         from git import Repo
     except ImportError:
         raise ImportError("GitPython is required. Install with: pip install gitpython")
-    
+
     if repo_path is None:
         repo_path = CONFIG["regression_data_repo"]
 
     if not Path(repo_path).exists():
         raise ValueError(f"Regression data repository not found at {repo_path}")
 
-    repo = Repo(repo_path)
-    commits = list(repo.iter_commits(max_count=n))
-    return [commit.hexsha for commit in commits]
+    head_sha = Repo(repo_path).head.commit.hexsha
+    return list(_last_n_commit_hashes(str(repo_path), n, head_sha))
 
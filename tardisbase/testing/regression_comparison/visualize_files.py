@@ -65,6 +65,9 @@ class MultiCommitCompare:
         self.file_transitions = {}
         self.all_files = set()
         self.transition_columns = []
+        self._modified_cache = {}
+        self._pair_diff_cache = {}
+        self._files_cache = {}
 
 
     def get_files_in_commit(self, commit_hash, file_extensions=None):
@@ -83,7 +86,18 @@ class MultiCommitCompare:
         -------
         set of str
             Set of file paths in the commit.
+
+        Notes
+        -----
+        Results are cached per (commit, extensions) pair: consecutive
+        transitions share their interior commit, so every commit but
+        the first and last would otherwise be enumerated twice.
         """
+        cache_key = (commit_hash, file_extensions)
+        cached = self._files_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         files = set()
 
         tree_output = self.repo.git.execute(['git', 'ls-tree', '-r', '--name-only', commit_hash])
@@ -92,6 +106,7 @@ class MultiCommitCompare:
             if filepath and (file_extensions is None or filepath.endswith(file_extensions)):
                 files.add(filepath)
 
+        self._files_cache[cache_key] = files
         return files
 
 
@@ -186,16 +201,76 @@ class MultiCommitCompare:
         ------
         ValueError
             If an invalid comparison function is configured.
+
+        Notes
+        -----
+        Results are cached per (file, commit pair) so re-running the
+        analysis does not spawn a new diff subprocess for a comparison
+        that has already been made.
         """
+        cache_key = (file_path, older_commit, newer_commit)
+        if cache_key in self._modified_cache:
+            return self._modified_cache[cache_key]
+
         if self.compare_function == "git_diff":
             diff_output = self.repo.git.diff(f'{older_commit}..{newer_commit}', '--', file_path)
-            return bool(diff_output.strip())
+            modified = bool(diff_output.strip())
         elif self.compare_function == "cmd_diff":
-            return self.cmd_diff_compare(file_path, older_commit, newer_commit)
+            modified = self.cmd_diff_compare(file_path, older_commit, newer_commit)
         else:
             # This should not happen due to validation in __init__, but just in case
             raise ValueError(f"Invalid compare_function '{self.compare_function}'. Available options: {self.available_functions}")
 
+        self._modified_cache[cache_key] = modified
+        return modified
+
+
+    def _changed_files_between(self, older_commit, newer_commit):
+        """
+        Map changed file paths to their git status for one commit pair.
+
+        Runs a single ``git diff --name-status -z`` per pair instead of
+        one diff subprocess per file, which is the dominant cost when a
+        transition touches many files. Results are cached per pair.
+
+        Parameters
+        ----------
+        older_commit : str
+            Older commit hash.
+        newer_commit : str
+            Newer commit hash.
+
+        Returns
+        -------
+        dict of str : str
+            File paths mapped to single-letter git statuses (A/D/M/...).
+        """
+        cache_key = (older_commit, newer_commit)
+        changed = self._pair_diff_cache.get(cache_key)
+        if changed is not None:
+            return changed
+
+        output = self.repo.git.diff(
+            "--name-status", "-z", f"{older_commit}..{newer_commit}"
+        )
+        changed = {}
+        tokens = output.split("\0")
+        i = 0
+        while i + 1 < len(tokens):
+            status = tokens[i]
+            if not status:
+                i += 1
+                continue
+            if status.startswith(("R", "C")):
+                # Rename/copy records carry two paths; keep the new one.
+                changed[tokens[i + 2]] = status[0]
+                i += 3
+            else:
+                changed[tokens[i + 1]] = status[0]
+                i += 2
+
+        self._pair_diff_cache[cache_key] = changed
+        return changed
 
     def get_changes_with_git(self, older_commit, newer_commit):
         """
@@ -215,77 +290,75 @@ class MultiCommitCompare:
         """
         older_files = self.get_files_in_commit(older_commit, self.file_extensions)
         newer_files = self.get_files_in_commit(newer_commit, self.file_extensions)
-        all_files = older_files | newer_files
 
-        changes = {}
-        for file_path in all_files:
-            in_older = file_path in older_files
-            in_newer = file_path in newer_files
+        # In git_diff mode a single --name-status diff answers the
+        # modified-or-not question for every file at once; the per-file
+        # comparison subprocess is only needed for cmd_diff.
+        if self.compare_function == "git_diff":
+            diffed = self._changed_files_between(older_commit, newer_commit)
 
-            if not in_older and not in_newer:
-                changes[file_path] = "−"
-            elif not in_older and in_newer:
-                changes[file_path] = "A"
-            elif in_older and not in_newer:
+            def modified(file_path):
+                return file_path in diffed
+
+        else:
+
+            def modified(file_path):
+                return self.is_file_modified(file_path, older_commit, newer_commit)
+
+        # Classify in a single pass over each set instead of materializing
+        # the union and re-testing membership for every file.
+        changes = {}
+        for file_path in older_files:
+            if file_path not in newer_files:
                 changes[file_path] = "D"
-            elif self.is_file_modified(file_path, older_commit, newer_commit):
+            elif modified(file_path):
                 changes[file_path] = "M"
             else:
                 changes[file_path] = "•"
+        for file_path in newer_files:
+            if file_path not in older_files:
+                changes[file_path] = "A"
 
         return changes
 
 
-    def create_file_data_row(self, file_path):
-        """
-        Create a data row for the file change matrix.
-
-        Parameters
-        ----------
-        file_path : str
-            File path for the row.
-
-        Returns
-        -------
-        dict of str : str
-            Row data with file path and change symbols.
-        """
-        row = {'Files': file_path}
-        for transition_key in self.transition_columns:
-            change_type = self.file_transitions.get(transition_key, {}).get(file_path, "−")
-            row[transition_key] = change_type
-        return row
-
-
     def get_dataframe_matrix(self):
         """
         Get the file change matrix as a DataFrame.
 
+        The matrix is assembled as one list per transition column and
+        handed to pandas in a single dict-of-columns call, rather than
+        as a dict per file row, which pandas would have to re-infer
+        column-by-column.
+
         Returns
         -------
         tuple of (pandas.Series, pandas.DataFrame) or (None, None)
             Legend series and matrix DataFrame, or None if no files found.
         """
-        all_data = [self.create_file_data_row(file_path)
-                   for file_path in sorted(self.all_files)]
-
-        if all_data:
-            df = pd.DataFrame(all_data)
-
-            # Create legend as pandas Series
-            legend_data = {
-                'A': 'Added',
-                'D': 'Deleted',
-                'M': 'Modified',
-                '•': 'Unchanged',
-                '−': 'Not-Present'
-            }
-            legend_series = pd.Series(legend_data, name='Legend')
-
-            return legend_series, df
-        else:
+        if not self.all_files:
             return None, None
 
+        files = sorted(self.all_files)
+        columns = {'Files': files}
+        for transition_key in self.transition_columns:
+            transitions = self.file_transitions.get(transition_key, {})
+            columns[transition_key] = [transitions.get(f, "−") for f in files]
+
+        df = pd.DataFrame(columns)
+
+        # Create legend as pandas Series
+        legend_data = {
+            'A': 'Added',
+            'D': 'Deleted',
+            'M': 'Modified',
+            '•': 'Unchanged',
+            '−': 'Not-Present'
+        }
+        legend_series = pd.Series(legend_data, name='Legend')
+
+        return legend_series, df
+
 
     def get_commit_info(self):
         """